@@ -8,12 +8,15 @@ import pathlib
 import subprocess
 import time
 
+import log
+
 from typing import List
 
 from collections.abc import Generator
-from util import check_call, gettempdir, SUBPROCESS_AS_SHELL, rmtree, check_json_call
+from util import check_call, gettempdir, rmtree, check_json_call
 from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from github import PR
+from git_backend import GitBackend, get_git_backend
 
 
 GIT_REPO_CLONE_URL = 'git@github.com:csm10495/commit-ment.git'
@@ -21,8 +24,9 @@ THIS_DIR = pathlib.Path(__file__).parent.resolve()
 
 
 class Branch:
-    def __init__(self, repo_path: pathlib.Path, name: str | None=None) -> None:
+    def __init__(self, repo_path: pathlib.Path, name: str | None=None, backend: GitBackend | None=None) -> None:
         self.repo_path = repo_path
+        self.backend = backend or get_git_backend()
         self.name = name or self.get_branch_name()
         branches_dir = self.repo_path / 'branches'
         branches_dir.mkdir(parents=True, exist_ok=True)
@@ -30,7 +34,7 @@ class Branch:
         self._last_index = None
 
     def get_branch_name(self) -> str:
-        return subprocess.check_output('git rev-parse --abbrev-ref HEAD', cwd=str(self.repo_path), shell=SUBPROCESS_AS_SHELL).decode().strip()
+        return self.backend.get_branch_name(self.repo_path)
 
     def get_live_index(self) -> int:
         try:
@@ -53,8 +57,7 @@ class Branch:
         self._last_index = idx
 
     def commit(self, idx: int) -> None:
-        check_call(f'git add "{self.file}"', cwd=str(self.repo_path))
-        check_call(f'git commit -m "Bumping idx -> {idx} for {self.name}"', cwd=str(self.repo_path))
+        self.backend.commit_file(self.repo_path, self.file, f'Bumping idx -> {idx} for {self.name}')
 
     def increment_and_commit(self) -> None:
         idx = self.get_index() + 1
@@ -63,7 +66,7 @@ class Branch:
 
     def swap_branch(self, name) -> None:
         self.name = name
-        check_call(f'git switch "{self.name}"', cwd=str(self.repo_path))
+        self.backend.switch(self.repo_path, self.name)
 
     @classmethod
     @contextlib.contextmanager
@@ -107,18 +110,18 @@ class Branch:
 
     def _push_and_clean_up(self):
         if self.name == 'master':
-            print(f"Attempting to pull/push for repo (master): {self.repo_path}")
+            log.info(f"Attempting to pull/push for repo (master): {self.repo_path}")
             self.pull_and_push_remote_branch(ignore_pull_fail=True)
         else:
-            print(f"Attempting to push for repo ({self.name}): {self.repo_path}")
+            log.info(f"Attempting to push for repo ({self.name}): {self.repo_path}")
             self.push_remote_branch()
 
-        print(f"cleaning up repo post push: {self.repo_path}")
+        log.info(f"cleaning up repo post push: {self.repo_path}")
         rmtree(self.repo_path)
 
     @classmethod
     def clean_up_local_clones(cls):
-        print("Cleaning up local clones (that were orphaned)")
+        log.info("Cleaning up local clones (that were orphaned)")
         TEMP = gettempdir()
         results = []
         with ProcessPoolExecutor() as executor:
@@ -127,13 +130,13 @@ class Branch:
                     try:
                         b = Branch(path)
                     except subprocess.CalledProcessError:
-                        print(f"Cleaning up invalid repo: {path}")
+                        log.info(f"Cleaning up invalid repo: {path}")
                         rmtree(path)
                         continue
 
                     results.append(executor.submit(b._push_and_clean_up))
                 else:
-                    print(f"Invalid path !?: {path}")
+                    log.info(f"Invalid path !?: {path}")
 
             for r in results:
                 r.result()
@@ -155,36 +158,34 @@ class Branch:
 
     @backoff.on_exception(backoff.expo, subprocess.CalledProcessError, max_tries=5, max_time=5)
     def merge(self, branch_name: str) -> None:
-        check_call(f'git merge "{branch_name}" --ff --no-edit', cwd=str(self.repo_path))
+        self.backend.merge(self.repo_path, branch_name)
 
     @backoff.on_exception(backoff.expo, subprocess.CalledProcessError, max_tries=2, max_time=5)
     def fetch_branch(self, branch_name: str) -> None:
-        check_call(f'git fetch origin "{branch_name}"', cwd=str(self.repo_path))
-        check_call(f'git branch "{branch_name}" FETCH_HEAD', cwd=str(self.repo_path))
+        self.backend.fetch_branch(self.repo_path, branch_name)
 
     def push_remote_branch(self) -> None:
-        check_call(f'git push -u origin "{self.name}"', cwd=str(self.repo_path))
+        self.backend.push(self.repo_path, self.name)
 
     def pull(self) -> None:
-        check_call(f'git pull -s recursive -X theirs origin {self.name}', cwd=str(self.repo_path))
+        self.backend.pull(self.repo_path, self.name)
 
     @backoff.on_exception(backoff.expo, subprocess.CalledProcessError, max_tries=10, max_time=5)
     def pull_and_push_remote_branch(self, ignore_pull_fail: bool = False) -> None:
         try:
             self.pull()
         except subprocess.CalledProcessError:
-            print("Ignoring pull fail")
+            log.info("Ignoring pull fail")
             if not ignore_pull_fail:
                 raise
 
         self.push_remote_branch()
 
     def list_remote_branches(self):
-        output = subprocess.check_output(f'git ls-remote --heads --quiet', cwd=str(self.repo_path), shell=SUBPROCESS_AS_SHELL).decode('utf-8')
-        return [line.split()[-1].split('refs/heads/')[-1] for line in output.splitlines()]
+        return self.backend.list_remote_heads(self.repo_path)
 
     def delete_remote_branch(self, branch: str) -> None:
-        check_call(f'git push origin --delete {branch}', cwd=str(self.repo_path))
+        self.backend.delete_remote_branch(self.repo_path, branch)
 
     def delete_remote_branches(self, branches: list[str]) -> None:
         with ThreadPoolExecutor(max_workers=32) as executor:
@@ -225,7 +226,7 @@ class Branch:
     def merge_pr(self, number: int, verify: bool = False):
         check_call(f'gh pr merge {number} --delete-branch --merge')
         if verify:
-            print(f"Waiting for PR {number} to merge")
+            log.info(f"Waiting for PR {number} to merge")
             while self.get_my_prs(limit=1, state='open', number=number):
                 time.sleep(1)
-            print(f"PR {number} merged")
+            log.info(f"PR {number} merged")
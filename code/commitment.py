@@ -2,14 +2,18 @@ from __future__ import annotations
 
 
 import argparse
+import atexit
 import os
 import time
 
 from branch import Branch
+from git_backend import GIT_BACKENDS
 from worker import start_job_worker, ThreadWorker, ProcessWorker # Must leave ThreadWorker/ProcessWorker
 from job import NewBranchThrashJob, MergeRemoteBranchesJob, MergePullRequestsJob, PullRequestCreatorJob
 from signals import SigintCatcher
 
+import log
+
 
 
 if __name__ == '__main__':
@@ -23,22 +27,34 @@ if __name__ == '__main__':
     parser.add_argument('--worker-continue-on-exception', action='store_true')
     parser.add_argument('-s', '--seconds', type=int, default=60)
     parser.add_argument('-t', '--worker-type', type=str, default='process')
-    parser.add_argument('-q', '--quiet', action='store_true')
+    verbosity_group = parser.add_mutually_exclusive_group()
+    verbosity_group.add_argument('-q', '--quiet', action='store_true', help='Only log errors (and output of failed commands)')
+    verbosity_group.add_argument('-v', '--verbose', action='store_true', help='Also log the output of every command')
+    parser.add_argument('-g', '--git-backend', type=str, default='subprocess', choices=list(GIT_BACKENDS))
     args = parser.parse_args()
 
     if args.quiet:
-        os.environ['SUBPROCESS_NO_OUTPUT'] = '1'
+        os.environ['LOG_VERBOSITY'] = str(log.ERROR)
+    elif args.verbose:
+        os.environ['LOG_VERBOSITY'] = str(log.DEBUG)
 
     if args.worker_continue_on_exception:
         os.environ['WORKER_CONTINUE_ON_EXCEPTION'] = '1'
 
+    os.environ['GIT_BACKEND'] = args.git_backend
+
+    # everything (including ProcessWorkers) logs through this one writer
+    log_writer = log.LogWriter()
+    log_writer.start()
+    atexit.register(log_writer.stop)
+
     if args.clean:
         Branch.clean_up_local_clones()
 
     workers = []
 
     worker_class = globals()[f'{args.worker_type.title()}Worker']
-    print(f"Using worker class: {worker_class.__name__}")
+    log.info(f"Using worker class: {worker_class.__name__}")
 
     if args.commit_workers is not None:
         for _ in range(args.commit_workers):
@@ -62,26 +78,29 @@ if __name__ == '__main__':
             death_time = time.time() + args.seconds
             while time.time() < death_time and not sigint_catcher.is_interrupted():
                 if not workers:
-                    print("... all workers died early")
+                    log.info("... all workers died early")
                     break
 
                 for w in workers:
                     if not w.is_alive():
                         w.join()
 
-                        print(f"Worker died early: {w}.. stopping others")
+                        log.info(f"Worker died early: {w}.. stopping others")
                         raise KeyboardInterrupt()
 
                 time.sleep(1)
+
+            if sigint_catcher.is_interrupted():
+                log.info(f"Caught signal: {sigint_catcher.caught_signal}")
         except KeyboardInterrupt:
-            print("Keyboard Interrupt!")
+            log.info("Keyboard Interrupt!")
         finally:
-            print("Requesting all workers stop")
+            log.info("Requesting all workers stop")
             for w in workers:
                 w.request_stop()
 
-            print("Joining all workers")
+            log.info("Joining all workers")
             for w in workers:
                 w.join()
     else:
-        print("No workers were started")
\ No newline at end of file
+        log.info("No workers were started")
\ No newline at end of file
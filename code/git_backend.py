@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import abc
+import contextlib
+import os
+import pathlib
+import subprocess
+
+from util import check_call, check_output
+
+try:
+    from dulwich import porcelain
+    from dulwich.repo import Repo
+except ImportError:
+    porcelain = None
+    Repo = None
+
+
+class GitBackend(abc.ABC):
+    '''
+    The set of git operations a Branch needs. Failures are raised as subprocess.CalledProcessError
+    regardless of backend, so existing retry/backoff handling keeps working.
+    '''
+    name = ''
+
+    @abc.abstractmethod
+    def get_branch_name(self, repo_path: pathlib.Path) -> str:
+        pass
+
+    @abc.abstractmethod
+    def commit_file(self, repo_path: pathlib.Path, file: pathlib.Path, message: str) -> None:
+        pass
+
+    @abc.abstractmethod
+    def list_remote_heads(self, repo_path: pathlib.Path) -> list[str]:
+        pass
+
+    def switch(self, repo_path: pathlib.Path, branch_name: str) -> None:
+        check_call(f'git switch "{branch_name}"', cwd=str(repo_path))
+
+    def merge(self, repo_path: pathlib.Path, branch_name: str) -> None:
+        check_call(f'git merge "{branch_name}" --ff --no-edit', cwd=str(repo_path))
+
+    def fetch_branch(self, repo_path: pathlib.Path, branch_name: str) -> None:
+        check_call(f'git fetch origin "{branch_name}"', cwd=str(repo_path))
+        check_call(f'git branch "{branch_name}" FETCH_HEAD', cwd=str(repo_path))
+
+    def push(self, repo_path: pathlib.Path, branch_name: str) -> None:
+        check_call(f'git push -u origin "{branch_name}"', cwd=str(repo_path))
+
+    def pull(self, repo_path: pathlib.Path, branch_name: str) -> None:
+        check_call(f'git pull -s recursive -X theirs origin {branch_name}', cwd=str(repo_path))
+
+    def delete_remote_branch(self, repo_path: pathlib.Path, branch_name: str) -> None:
+        check_call(f'git push origin --delete {branch_name}', cwd=str(repo_path))
+
+
+class SubprocessGitBackend(GitBackend):
+    name = 'subprocess'
+
+    def get_branch_name(self, repo_path: pathlib.Path) -> str:
+        return check_output('git rev-parse --abbrev-ref HEAD', cwd=str(repo_path)).strip()
+
+    def commit_file(self, repo_path: pathlib.Path, file: pathlib.Path, message: str) -> None:
+        check_call(f'git add "{file}"', cwd=str(repo_path))
+        check_call(f'git commit -m "{message}"', cwd=str(repo_path))
+
+    def list_remote_heads(self, repo_path: pathlib.Path) -> list[str]:
+        output = check_output(f'git ls-remote --heads --quiet', cwd=str(repo_path))
+        return [line.split()[-1].split('refs/heads/')[-1] for line in output.splitlines()]
+
+
+class DulwichGitBackend(GitBackend):
+    '''
+    Does the hot-path operations (index bump commits, ref reads, listing remote heads) via dulwich.
+    Everything else (merge, fetch, push, etc) still goes through the git cli.
+
+    Commits and ref reads never spawn a process. Listing remote heads is only in-process for local/file remotes:
+    for ssh remotes (like GIT_REPO_CLONE_URL) dulwich's default ssh vendor still spawns ssh.
+
+    Repos are opened with Repo.discover() so repo_path can be a subdirectory (like THIS_DIR), same as the git cli.
+    '''
+    name = 'dulwich'
+
+    def __init__(self):
+        if porcelain is None:
+            raise ImportError('dulwich is required for the dulwich git backend: pip install dulwich')
+
+    @contextlib.contextmanager
+    def _raise_as_called_process_error(self, cmd: str):
+        try:
+            yield
+        except subprocess.CalledProcessError:
+            raise
+        except Exception as ex:
+            raise subprocess.CalledProcessError(1, cmd, output='', stderr=str(ex)) from ex
+
+    def get_branch_name(self, repo_path: pathlib.Path) -> str:
+        with self._raise_as_called_process_error('dulwich: read HEAD'):
+            with Repo.discover(str(repo_path)) as repo:
+                ref_chain, _ = repo.refs.follow(b'HEAD')
+
+        # a detached HEAD doesn't follow to a branch, same as git rev-parse --abbrev-ref HEAD -> HEAD
+        return ref_chain[-1].decode().split('refs/heads/', 1)[-1]
+
+    def commit_file(self, repo_path: pathlib.Path, file: pathlib.Path, message: str) -> None:
+        with self._raise_as_called_process_error(f'dulwich: commit {file}'):
+            with Repo.discover(str(repo_path)) as repo:
+                porcelain.add(repo, paths=[str(file)])
+                porcelain.commit(repo, message=message.encode())
+
+    def list_remote_heads(self, repo_path: pathlib.Path) -> list[str]:
+        with self._raise_as_called_process_error('dulwich: ls-remote --heads'):
+            with Repo.discover(str(repo_path)) as repo:
+                url = repo.get_config().get((b'remote', b'origin'), b'url').decode()
+
+            result = porcelain.ls_remote(url)
+
+        # newer dulwich versions wrap the refs dict in a result object
+        refs = getattr(result, 'refs', result)
+        return [ref.decode().split('refs/heads/', 1)[-1] for ref in refs if ref.startswith(b'refs/heads/')]
+
+
+GIT_BACKENDS = {
+    SubprocessGitBackend.name: SubprocessGitBackend,
+    DulwichGitBackend.name: DulwichGitBackend,
+}
+
+
+def get_git_backend(name: str | None = None) -> GitBackend:
+    '''
+    Get a git backend by name. Defaults to the GIT_BACKEND env var (so process workers pick it up), then subprocess.
+    '''
+    name = name or os.environ.get('GIT_BACKEND') or SubprocessGitBackend.name
+    try:
+        return GIT_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown git backend: {name}. Options: {', '.join(GIT_BACKENDS)}")
@@ -2,6 +2,8 @@ import abc
 import uuid
 import subprocess
 
+import log
+
 from branch import Branch, GIT_REPO_CLONE_URL
 from util import check_call, gettempdir, rmtree
 from github import handle_gh_backoff
@@ -41,13 +43,13 @@ class Job(abc.ABC):
 
 class NullJob(Job):
     def do_single_task(self):
-        print("Doing a single task")
+        log.info("Doing a single task")
 
     def setup(self):
-        print("Doing setup")
+        log.info("Doing setup")
 
     def teardown(self):
-        print("Doing teardown")
+        log.info("Doing teardown")
 
 
 class ShallowCloneJob(Job):
@@ -56,7 +58,8 @@ class ShallowCloneJob(Job):
         Job.__init__(self)
 
     def setup(self):
-        print(f"Creating a shallow clone for branch: {self.branch_name}")
+        log.set_context(branch=self.branch_name)
+        log.info(f"Creating a shallow clone for branch: {self.branch_name}")
 
         tmpdir = gettempdir() / f'commit-ment_{self.branch_name}'
 
@@ -68,7 +71,7 @@ class ShallowCloneJob(Job):
                 check_call('git reset --hard', cwd=tmpdir)
                 check_call(f'git pull origin {self.branch_name} --ff', cwd=tmpdir)
             except subprocess.CalledProcessError:
-                print("Failed to reset repo.. deleting it to reset")
+                log.info("Failed to reset repo.. deleting it to reset")
                 rmtree(tmpdir)
                 do_clone = True
 
@@ -102,7 +105,7 @@ class NewBranchThrashJob(ShallowCloneJob):
 
 
     def _push_and_start_new(self):
-        print(f"Pushing: {self.branch_name} then starting a new branch")
+        log.info(f"Pushing: {self.branch_name} then starting a new branch")
         self.teardown()
         self.__init__(commits_per_branch=self._commits_per_branch)
         self.setup()
@@ -118,19 +121,20 @@ class MergeRemoteBranchesJob(ShallowCloneJob):
 
         if remote_branches:
             for branch in remote_branches:
-                print(f"Merging branch: {branch}")
+                log.info(f"Merging branch: {branch}")
 
                 self.branch_obj.fetch_branch(branch)
 
                 try:
                     self.branch_obj.merge(f'{branch}')
                 except subprocess.CalledProcessError as err:
-                    print(f"Failed to merge branch: {branch}.. {err}\n{err.stderr}\n{err.stdout}")
+                    log.dump_failed_command(err)
+                    log.error(f"Failed to merge branch: {branch}.. {err}")
 
-            print("Pushing merged to master")
+            log.info("Pushing merged to master")
             self.branch_obj.pull_and_push_remote_branch()
 
-            print("Deleting remote branches")
+            log.info("Deleting remote branches")
             self.branch_obj.delete_remote_branches(remote_branches)
 
 
@@ -144,7 +148,7 @@ class MergePullRequestsJob(Job):
         with handle_gh_backoff(self, branch):
             prs = branch.get_my_prs(limit=1, state='open')
             if prs:
-                print(f"Merging PR: {prs[0]} ({prs[0].head})")
+                log.info(f"Merging PR: {prs[0]} ({prs[0].head})")
                 branch.merge_pr(prs[0].number, verify=True)
                 merged_pr = True
 
@@ -165,13 +169,13 @@ class PullRequestCreatorJob(Job):
             with handle_gh_backoff(self, branch, i):
                 open_pr = branch.get_my_prs(limit=1, state='open', head=i)
                 if not open_pr:
-                    print(f"Creating PR for branch: {i}")
+                    log.info(f"Creating PR for branch: {i}")
                     branch.create_pr_for_branch(i)
                     created_pr = True
                     break
 
                 if branch.get_my_prs(limit=1, state='merged', head=i):
-                    print(f"Branch is merged but not deleted? Deleting it: {i}")
+                    log.info(f"Branch is merged but not deleted? Deleting it: {i}")
                     branch.delete_remote_branch(i)
 
         if not created_pr:
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+from dataclasses import dataclass, field
+
+# Verbosity levels. A record is written if its level <= LOG_VERBOSITY.
+ERROR = 0
+INFO = 1
+DEBUG = 2
+
+LEVEL_NAMES = {ERROR: 'ERROR', INFO: 'INFO', DEBUG: 'DEBUG'}
+
+# Max records the writer will pull off the queue before doing a single write
+LOG_BATCH_SIZE = 256
+
+# Max lines of a command's output kept around to dump if it fails
+COMMAND_RING_BUFFER_LINES = 50
+
+_queue = None
+_context = threading.local()
+
+
+@dataclass
+class LogRecord:
+    level: int
+    message: str
+    worker: str | None = None
+    job: str | None = None
+    branch: str | None = None
+    command: str | None = None
+    created: float = field(default_factory=time.time)
+
+    def format(self) -> str:
+        tags = '|'.join(t for t in (self.worker, self.job, self.branch) if t)
+        command = f' ({self.command})' if self.command else ''
+        timestamp = time.strftime('%H:%M:%S', time.localtime(self.created))
+        return f'{timestamp} {LEVEL_NAMES[self.level]:<5} [{tags}]{command} {self.message}'
+
+
+def get_verbosity() -> int:
+    '''
+    Read from the env so ProcessWorkers pick up what the main process was told.
+    '''
+    return int(os.environ.get('LOG_VERBOSITY', INFO))
+
+
+def get_queue() -> multiprocessing.Queue | None:
+    return _queue
+
+
+def set_queue(q: multiprocessing.Queue | None) -> None:
+    '''
+    Used by workers (that may be in another process) to write to the main process's writer.
+    '''
+    global _queue
+    _queue = q
+
+
+def set_context(**tags) -> None:
+    '''
+    Set worker/job/branch tags that get attached to every record logged from this thread.
+    '''
+    for k, v in tags.items():
+        setattr(_context, k, v)
+
+
+def get_context() -> dict:
+    '''
+    Get this thread's tags, so helper threads (like output readers) can carry them over via set_context().
+    '''
+    return dict(vars(_context))
+
+
+def log(level: int, message: str, command: str | None = None) -> None:
+    if level > get_verbosity():
+        return
+
+    record = LogRecord(level=level,
+                       message=message,
+                       worker=getattr(_context, 'worker', None),
+                       job=getattr(_context, 'job', None),
+                       branch=getattr(_context, 'branch', None),
+                       command=command)
+
+    if _queue is None:
+        # no writer running.. just write it ourselves
+        _write_batch([record])
+    else:
+        _queue.put(record)
+
+
+def error(message: str, command: str | None = None) -> None:
+    log(ERROR, message, command)
+
+
+def info(message: str, command: str | None = None) -> None:
+    log(INFO, message, command)
+
+
+def debug(message: str, command: str | None = None) -> None:
+    log(DEBUG, message, command)
+
+
+def dump_failed_command(ex: BaseException) -> None:
+    '''
+    If ex is a failed command from check_call()/check_json_call(), dump its ring buffer of (stream name, line) tuples.
+    '''
+    if not isinstance(ex, subprocess.CalledProcessError):
+        return
+
+    error(f'Command failed with return code: {ex.returncode}', ex.cmd)
+    for stream_name, line in getattr(ex, 'output_tail', []):
+        error(f'{stream_name}: {line}', ex.cmd)
+
+
+def _write_batch(records: list[LogRecord]) -> None:
+    # everything goes to stdout so records stay in order
+    sys.stdout.write(''.join(r.format() + '\n' for r in records))
+    sys.stdout.flush()
+
+
+class LogWriter:
+    '''
+    A single background thread (in the main process) that drains the log queue and writes records in batches.
+    '''
+    def __init__(self):
+        self._queue = multiprocessing.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        set_queue(self._queue)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+        set_queue(None)
+
+    def _run(self) -> None:
+        # this thread must keep draining until it sees the None sentinel, no matter what. If it stopped, ProcessWorkers
+        # would hang at exit waiting for their queue to flush.
+        done = False
+        while not done:
+            try:
+                batch = [self._queue.get()]
+                while len(batch) < LOG_BATCH_SIZE:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+            except Exception as ex:
+                self._write_fallback(f'Failed to read from the log queue: {ex!r}')
+                continue
+
+            if None in batch:
+                done = True
+                batch = batch[:batch.index(None)]
+
+            if batch:
+                try:
+                    _write_batch(batch)
+                except Exception as ex:
+                    # ex: BrokenPipeError if piped to head, UnicodeEncodeError on a non-utf-8 console
+                    self._write_fallback(f'Failed to write log batch: {ex!r}', batch)
+
+    def _write_fallback(self, message: str, batch: list[LogRecord] | None = None) -> None:
+        try:
+            lines = [message] + [r.format() for r in batch or []]
+            sys.__stderr__.write(''.join(line + '\n' for line in lines))
+            sys.__stderr__.flush()
+        except Exception:
+            # nowhere left to write to.. just drop it
+            pass
@@ -4,9 +4,11 @@ import multiprocessing
 class SigintCatcher:
     def __init__(self):
         self._event = multiprocessing.Event()
+        self.caught_signal = None
 
     def handler(self, signal, frame):
-        print(f"Caught signal: {signal}, {frame}")
+        # don't log from here: that'd put() on the log queue, which deadlocks if we interrupted another put()
+        self.caught_signal = signal
         self._event.set()
 
     def is_interrupted(self):
@@ -6,8 +6,10 @@ import json
 import tempfile
 import subprocess
 import threading
-import sys
 import io
+import collections
+
+import log
 
 SUBPROCESS_AS_SHELL = (os.name != 'nt')
 
@@ -25,31 +27,27 @@ def gettempdir() -> pathlib.Path:
 
 
 def check_call(cmd, cwd=None):
-    no_output = os.environ.get('SUBPROCESS_NO_OUTPUT')
-    if not no_output:
-        print(f'Running command: {cmd}')
+    log.info('Running command', cmd)
 
     proc = subprocess.Popen(cmd, cwd=cwd, shell=SUBPROCESS_AS_SHELL, stdin=subprocess.PIPE,
                             stdout=subprocess.PIPE, stderr=subprocess.PIPE)
 
     stdout = io.BytesIO()
     stderr = io.BytesIO()
-
-    def handle_stdout():
-        for c in iter(lambda: proc.stdout.read(1), b""):
-            stdout.write(c)
-            if not no_output:
-                sys.stdout.buffer.write(c)
-
-    def handle_stderr():
-        for ci in iter(lambda: proc.stderr.read(1), b""):
-            stderr.write(ci)
-            if not no_output:
-                sys.stderr.buffer.write(ci)
-
-    stdout_thread = threading.Thread(target=handle_stdout)
+    ring_buffer = collections.deque(maxlen=log.COMMAND_RING_BUFFER_LINES)
+    log_context = log.get_context()
+
+    def handle_stream(stream, buffer, stream_name):
+        log.set_context(**log_context)
+        for line in iter(stream.readline, b""):
+            buffer.write(line)
+            decoded = line.decode('utf-8', errors='replace').rstrip()
+            ring_buffer.append((stream_name, decoded))
+            log.debug(f'{stream_name}: {decoded}', cmd)
+
+    stdout_thread = threading.Thread(target=handle_stream, args=(proc.stdout, stdout, 'stdout'))
     stdout_thread.start()
-    stderr_thread = threading.Thread(target=handle_stderr)
+    stderr_thread = threading.Thread(target=handle_stream, args=(proc.stderr, stderr, 'stderr'))
     stderr_thread.start()
 
     stdout_thread.join()
@@ -57,14 +55,26 @@ def check_call(cmd, cwd=None):
 
     retcode = proc.wait()
     if retcode:
-        raise subprocess.CalledProcessError(retcode, cmd, output=stdout.getvalue().decode('utf-8'), stderr=stderr.getvalue().decode('utf-8'))
+        # plenty of callers expect (and recover from) failures.. so leave it to them to log.dump_failed_command()
+        ex = subprocess.CalledProcessError(retcode, cmd, output=stdout.getvalue().decode('utf-8'), stderr=stderr.getvalue().decode('utf-8'))
+        ex.output_tail = list(ring_buffer)
+        raise ex
+
+def check_output(cmd, cwd=None) -> str:
+    '''
+    Like check_call() but returns stdout instead of logging it. stderr is only kept for the ring buffer on failure.
+    '''
+    log.info('Running command', cmd)
+
+    proc = subprocess.run(cmd, cwd=cwd, shell=SUBPROCESS_AS_SHELL, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stdout = proc.stdout.decode('utf-8', errors='replace')
+    stderr = proc.stderr.decode('utf-8', errors='replace')
+    if proc.returncode:
+        ex = subprocess.CalledProcessError(proc.returncode, cmd, output=stdout, stderr=stderr)
+        ex.output_tail = [('stderr', line) for line in stderr.splitlines()[-log.COMMAND_RING_BUFFER_LINES:]]
+        raise ex
+
+    return stdout
 
 def check_json_call(cmd, cwd=None):
-    kwargs = {}
-    if os.environ.get('SUBPROCESS_NO_OUTPUT'):
-        kwargs = dict(stderr=subprocess.DEVNULL)
-    else:
-        print(f'Running command: {cmd}')
-
-
-    return json.loads(subprocess.check_output(cmd, cwd=cwd, shell=SUBPROCESS_AS_SHELL, **kwargs).decode('utf-8'))
\ No newline at end of file
+    return json.loads(check_output(cmd, cwd=cwd))
@@ -4,6 +4,8 @@ import threading
 import traceback
 import time
 
+import log
+
 from typing import Type
 from job import Job, JobTaskNeedsBackoff
 
@@ -12,6 +14,8 @@ class Worker:
     def __init__(self, job: Job):
         self._job = job
         self._stop_requested_event = multiprocessing.Event()
+        # kept on the instance so a ProcessWorker can still reach the main process's log writer
+        self._log_queue = log.get_queue()
 
         super().__init__()
 
@@ -19,6 +23,9 @@ class Worker:
         self._stop_requested_event.set()
 
     def run(self):
+        log.set_queue(self._log_queue)
+        log.set_context(worker=self.name, job=type(self._job).__name__)
+
         try:
             self._job.setup()
             try:
@@ -26,20 +33,20 @@ class Worker:
                     try:
                         self._job.do_single_task()
                     except JobTaskNeedsBackoff as ex:
-                        print(f"Job requested backoff: {ex}")
+                        log.info(f"Job requested backoff: {ex}")
                         self.sleep_for_backoff(ex.seconds)
                     except Exception as ex:
                         if os.environ.get('WORKER_CONTINUE_ON_EXCEPTION'):
-                            print(f"do_single_task raised an unhandled exception: {ex}")
-                            traceback.print_exc()
-                            print(f"Continuing because WORKER_CONTINUE_ON_EXCEPTION is set")
+                            log.dump_failed_command(ex)
+                            log.error(f"do_single_task raised an unhandled exception: {ex}\n{traceback.format_exc()}")
+                            log.info(f"Continuing because WORKER_CONTINUE_ON_EXCEPTION is set")
                         else:
                             raise
             finally:
                 self._job.teardown()
-        except BaseException:
-            print("Exception made it to the outer exception check of run():")
-            traceback.print_exc()
+        except BaseException as ex:
+            log.dump_failed_command(ex)
+            log.error(f"Exception made it to the outer exception check of run():\n{traceback.format_exc()}")
 
     def sleep_for_backoff(self, seconds: int):
         death_time = time.time() + seconds
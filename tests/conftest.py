@@ -0,0 +1,5 @@
+import pathlib
+import sys
+
+# code/ is a flat directory of scripts that import each other by module name
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent / 'code'))
@@ -0,0 +1,92 @@
+import subprocess
+
+import pytest
+
+from git_backend import get_git_backend
+
+
+@pytest.fixture(params=['subprocess', 'dulwich'])
+def backend(request):
+    if request.param == 'dulwich':
+        pytest.importorskip('dulwich')
+    return get_git_backend(request.param)
+
+
+def git(cwd, *args) -> str:
+    return subprocess.check_output(['git', *args], cwd=str(cwd)).decode().strip()
+
+
+@pytest.fixture
+def clone(tmp_path, monkeypatch):
+    # don't let git wander up into some enclosing repo
+    monkeypatch.setenv('GIT_CEILING_DIRECTORIES', str(tmp_path))
+
+    remote = tmp_path / 'remote.git'
+    git(tmp_path, 'init', '-q', '--bare', '-b', 'master', str(remote))
+    repo = tmp_path / 'clone'
+    git(tmp_path, 'clone', '-q', str(remote), str(repo))
+    git(repo, 'checkout', '-q', '-b', 'master')
+    git(repo, 'config', 'user.name', 'commit-ment')
+    git(repo, 'config', 'user.email', 'commit-ment@example.com')
+    git(repo, 'commit', '-q', '--allow-empty', '-m', 'initial')
+    git(repo, 'push', '-q', 'origin', 'master')
+    return repo
+
+
+def test_get_branch_name(backend, clone):
+    assert backend.get_branch_name(clone) == 'master'
+
+    git(clone, 'checkout', '-q', '-b', 'some-branch')
+    assert backend.get_branch_name(clone) == 'some-branch'
+
+
+def test_get_branch_name_detached_head(backend, clone):
+    git(clone, 'checkout', '-q', '--detach')
+    assert backend.get_branch_name(clone) == 'HEAD'
+
+
+def test_get_branch_name_not_a_repo(backend, tmp_path, monkeypatch):
+    monkeypatch.setenv('GIT_CEILING_DIRECTORIES', str(tmp_path))
+    with pytest.raises(subprocess.CalledProcessError):
+        backend.get_branch_name(tmp_path)
+
+
+def test_commit_file(backend, clone):
+    branches_dir = clone / 'branches'
+    branches_dir.mkdir()
+    file = branches_dir / 'master'
+    file.write_text('1')
+
+    backend.commit_file(clone, file, 'Bumping idx -> 1 for master')
+
+    assert git(clone, 'log', '-1', '--format=%s') == 'Bumping idx -> 1 for master'
+    assert git(clone, 'show', 'HEAD:branches/master') == '1'
+    assert git(clone, 'status', '--porcelain') == ''
+
+
+def test_list_remote_heads(backend, clone):
+    assert backend.list_remote_heads(clone) == ['master']
+
+    git(clone, 'checkout', '-q', '-b', 'some-branch')
+    git(clone, 'push', '-q', 'origin', 'some-branch')
+
+    assert sorted(backend.list_remote_heads(clone)) == ['master', 'some-branch']
+
+
+def test_from_subdirectory(backend, clone):
+    # like Branch.from_this_clone(), which points at code/ rather than the repo root
+    subdir = clone / 'code'
+    subdir.mkdir()
+
+    assert backend.get_branch_name(subdir) == 'master'
+    assert backend.list_remote_heads(subdir) == ['master']
+
+    branches_dir = clone / 'branches'
+    branches_dir.mkdir()
+    file = branches_dir / 'master'
+    file.write_text('1')
+
+    backend.commit_file(subdir, file, 'Bumping idx -> 1 for master')
+
+    assert git(clone, 'log', '-1', '--format=%s') == 'Bumping idx -> 1 for master'
+    assert git(clone, 'status', '--porcelain') == ''
@@ -0,0 +1,116 @@
+import io
+import queue
+import subprocess
+import sys
+
+import pytest
+
+import log
+import util
+
+
+@pytest.fixture(autouse=True)
+def clean_log_state(monkeypatch):
+    monkeypatch.delenv('LOG_VERBOSITY', raising=False)
+    yield
+    log.set_queue(None)
+    vars(log._context).clear()
+
+
+def test_check_call_failure_keeps_ring_buffer():
+    with pytest.raises(subprocess.CalledProcessError) as ex_info:
+        util.check_call(f'seq 1 {log.COMMAND_RING_BUFFER_LINES * 2}; exit 3')
+
+    ex = ex_info.value
+    assert ex.returncode == 3
+    assert len(ex.output_tail) == log.COMMAND_RING_BUFFER_LINES
+    assert ex.output_tail[0] == ('stdout', str(log.COMMAND_RING_BUFFER_LINES + 1))
+    assert ex.output_tail[-1] == ('stdout', str(log.COMMAND_RING_BUFFER_LINES * 2))
+
+
+def test_check_call_failure_keeps_stream_names():
+    with pytest.raises(subprocess.CalledProcessError) as ex_info:
+        util.check_call('echo bad >&2; exit 1')
+
+    assert ex_info.value.output_tail == [('stderr', 'bad')]
+
+
+def test_dump_failed_command(capsys):
+    with pytest.raises(subprocess.CalledProcessError) as ex_info:
+        util.check_call('echo bad >&2; exit 1')
+    capsys.readouterr()
+
+    log.dump_failed_command(ex_info.value)
+    log.dump_failed_command(ValueError('not a failed command'))
+
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 2
+    assert 'ERROR' in lines[0] and 'Command failed with return code: 1' in lines[0]
+    assert 'ERROR' in lines[1] and 'stderr: bad' in lines[1]
+
+
+def test_verbosity_filters_records(monkeypatch):
+    records = queue.Queue()
+    log.set_queue(records)
+    monkeypatch.setenv('LOG_VERBOSITY', str(log.ERROR))
+
+    log.debug('debug')
+    log.info('info')
+    log.error('error')
+
+    assert records.get_nowait().message == 'error'
+    assert records.empty()
+
+
+def test_records_are_tagged():
+    records = queue.Queue()
+    log.set_queue(records)
+    log.set_context(worker='worker-1', job='NullJob', branch='some-branch')
+
+    log.info('hello', 'git status')
+
+    record = records.get_nowait()
+    assert (record.worker, record.job, record.branch, record.command) == ('worker-1', 'NullJob', 'some-branch', 'git status')
+    assert '[worker-1|NullJob|some-branch] (git status) hello' in record.format()
+
+
+def test_writer_writes_everything_before_stop(capsys):
+    writer = log.LogWriter()
+    writer.start()
+
+    count = log.LOG_BATCH_SIZE * 3 + 1
+    for i in range(count):
+        log.info(f'record {i}')
+
+    writer.stop()
+
+    assert not writer._thread.is_alive()
+    assert log.get_queue() is None
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split()[-1] for line in lines] == [str(i) for i in range(count)]
+
+
+def test_writer_falls_back_and_keeps_draining(monkeypatch):
+    def broken_write_batch(records):
+        raise BrokenPipeError(32, 'Broken pipe')
+
+    fallback = io.StringIO()
+    monkeypatch.setattr(log, '_write_batch', broken_write_batch)
+    monkeypatch.setattr(sys, '__stderr__', fallback)
+
+    writer = log.LogWriter()
+    writer.start()
+
+    count = log.LOG_BATCH_SIZE * 2
+    for i in range(count):
+        log.info(f'record {i}')
+
+    writer.stop()
+
+    assert not writer._thread.is_alive()
+
+    output = fallback.getvalue()
+    assert 'Failed to write log batch: BrokenPipeError' in output
+    for i in range(count):
+        assert f'record {i}\n' in output